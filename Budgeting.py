@@ -174,6 +174,33 @@ def init_db():
                   TEXT
               );
               """)
+    # Arquivo frio: meses fechados saem da tabela quente e só são lidos sob demanda (por período)
+    run_query("""
+              CREATE TABLE IF NOT EXISTS transacoes_arquivo
+              (
+                  id
+                  INTEGER
+                  PRIMARY
+                  KEY,
+                  descricao
+                  TEXT,
+                  valor
+                  REAL,
+                  categoria
+                  TEXT,
+                  tipo
+                  TEXT,
+                  data_str
+                  TEXT,
+                  group_id
+                  TEXT,
+                  parcela_info
+                  TEXT,
+                  periodo
+                  TEXT
+              );
+              """)
+    run_query("CREATE INDEX IF NOT EXISTS idx_transacoes_arquivo_periodo ON transacoes_arquivo (periodo)")
     run_query("""
               CREATE TABLE IF NOT EXISTS categorias
               (
@@ -223,6 +250,9 @@ init_db()
 
 
 # --- FUNÇÕES CORE (ADAPTADAS PARA SQL) ---
+MESES_ARQUIVO_PADRAO = 12  # Meses mantidos na tabela quente 'transacoes'
+
+
 def add_transacao_complexa(desc, valor, cat, tipo, data_obj, recorrencia, qtd_parcelas=1):
     group_id = f"{int(time.time())}_{random.randint(1000, 9999)}"
 
@@ -253,18 +283,45 @@ def add_transacao_complexa(desc, valor, cat, tipo, data_obj, recorrencia, qtd_pa
 
 
 def delete_transacao(id_transacao, delete_group=False, group_id=None):
-    if delete_group and group_id:
-        run_query("DELETE FROM transacoes WHERE group_id = :gid", {"gid": group_id})
-    else:
-        run_query("DELETE FROM transacoes WHERE id = :id", {"id": id_transacao})
+    for tabela in ("transacoes", "transacoes_arquivo"):
+        if delete_group and group_id:
+            run_query(f"DELETE FROM {tabela} WHERE group_id = :gid", {"gid": group_id})
+        else:
+            run_query(f"DELETE FROM {tabela} WHERE id = :id", {"id": id_transacao})
 
 
 def get_transacoes():
     return get_data("SELECT * FROM transacoes")
 
 
+def get_transacoes_arquivadas(periodo):
+    """Lê do arquivo frio apenas o mês pedido (YYYY-MM)"""
+    return get_data(
+        "SELECT id, descricao, valor, categoria, tipo, data_str, group_id, parcela_info FROM transacoes_arquivo WHERE periodo = :p",
+        {"p": periodo})
+
+
+def arquivar_periodos(meses_corte):
+    """Move para o arquivo os meses anteriores ao corte (em meses atrás) e retorna o período de corte"""
+    corte = (datetime.now().date().replace(day=1) - relativedelta(months=meses_corte)).strftime("%Y-%m")
+    # DELETE ... RETURNING + INSERT em um único comando: a movimentação é atômica.
+    # Só linhas com data ISO (YYYY-MM...) são movidas, para que 'periodo' seja alcançável pelo filtro de mês.
+    run_query("""
+              WITH movidas AS (
+                  DELETE FROM transacoes
+                  WHERE data_str ~ '^[0-9]{4}-[0-9]{2}' AND substring(data_str, 1, 7) < :corte
+                  RETURNING *
+              )
+              INSERT INTO transacoes_arquivo (id, descricao, valor, categoria, tipo, data_str, group_id, parcela_info, periodo)
+              SELECT id, descricao, valor, categoria, tipo, data_str, group_id, parcela_info, substring(data_str, 1, 7)
+              FROM movidas
+              """, {"corte": corte})
+    return corte
+
+
 def limpar_transacoes():
     run_query("DELETE FROM transacoes")
+    run_query("DELETE FROM transacoes_arquivo")
 
 
 # --- Categorias ---
@@ -292,6 +349,8 @@ def update_categoria(id_cat, novo_nome, nova_cor, nome_antigo):
                   {"n": novo_nome, "c": nova_cor, "id": id_cat})
         if novo_nome != nome_antigo:
             run_query("UPDATE transacoes SET categoria = :n WHERE categoria = :o", {"n": novo_nome, "o": nome_antigo})
+            run_query("UPDATE transacoes_arquivo SET categoria = :n WHERE categoria = :o",
+                      {"n": novo_nome, "o": nome_antigo})
             run_query("UPDATE metas SET categoria = :n WHERE categoria = :o", {"n": novo_nome, "o": nome_antigo})
         return True
     except:
@@ -343,11 +402,89 @@ def gerar_fake_data():
 if 'privacy' not in st.session_state: st.session_state.privacy = False
 
 
-def fmt_moeda(valor):
-    if st.session_state.privacy: return "R$ ••••"
+def _fmt_moeda(valor, privacy):
+    if privacy: return "R$ ••••"
     return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
 
 
+def fmt_moeda(valor):
+    return _fmt_moeda(valor, st.session_state.privacy)
+
+
+# --- RENDERIZAÇÃO ---
+# Blocos HTML do dashboard como funções puras dos valores agregados + flag de privacidade
+def html_card_saldo(saldo, privacy):
+    cor_saldo = COR_KIWI if saldo >= 0 else COR_VERMELHO
+    classe_barra_saldo = "border-bottom-green" if saldo >= 0 else "border-bottom-red"
+    return f"""
+    <div class="card-box {classe_barra_saldo}" style="text-align:center;">
+        <div class="card-label">SALDO DISPONÍVEL (MÊS)</div>
+        <div class="card-value" style="color: {cor_saldo}; font-size: 40px;">{_fmt_moeda(saldo, privacy)}</div>
+    </div>
+    """
+
+
+def html_card_fluxo(label, valor, classe_borda, privacy):
+    return f"""
+        <div class="card-box {classe_borda}">
+            <div class="card-label">{label}</div>
+            <div class="card-value">{_fmt_moeda(valor, privacy)}</div>
+        </div>
+        """
+
+
+def html_card_meta(categoria_meta, gasto_atual, teto, cor_categoria, privacy):
+    if teto > 0:
+        progresso = max(0.0, min(gasto_atual / teto, 1.0))
+        pct = (gasto_atual / teto) * 100
+        excedido = gasto_atual > teto
+    else:  # Teto zerado, negativo ou ausente (NaN): qualquer gasto já estoura o limite
+        excedido = gasto_atual > 0
+        progresso = 1.0 if excedido else 0.0
+        pct = progresso * 100
+    cor_barra = cor_categoria
+    cor_texto = "#FFFFFF"
+    aviso = ""
+
+    if excedido:
+        cor_barra = COR_VERMELHO
+        cor_texto = COR_VERMELHO
+        aviso = "LIMITE EXCEDIDO"
+
+    return f"""
+                <div style="background-color: #121212; padding: 15px; border-radius: 8px; border: 1px solid #333; margin-bottom: 15px;">
+                    <div style="font-weight: bold; font-size: 14px; margin-bottom: 5px; color:{cor_barra}">{categoria_meta}</div>
+                    <div style="font-size: 12px; color: #999; display: flex; justify-content: space-between;">
+                        <span>Gasto: {_fmt_moeda(gasto_atual, privacy)}</span>
+                        <span>Teto: {_fmt_moeda(teto, privacy)}</span>
+                    </div>
+                    <div style="width: 100%; background-color: #333; height: 8px; border-radius: 4px; margin-top: 8px;">
+                        <div style="width: {progresso * 100}%; background-color: {cor_barra}; height: 8px; border-radius: 4px;"></div>
+                    </div>
+                    <div style="display:flex; justify-content:space-between; margin-top:4px;">
+                        <span style="font-size: 10px; color: {cor_texto}; font-weight:bold;">{aviso}</span>
+                        <span style="font-size: 11px; color: #999;">{pct:.1f}%</span>
+                    </div>
+                </div>
+                """
+
+
+# Figura memorizada pelos dados agregados + privacidade e compartilhada entre sessões (somente leitura).
+# cache_resource devolve o mesmo objeto, sem o pickle/revalidação que cache_data faria a cada uso;
+# não alterar a figura retornada (nada de update_layout/update_traces depois do cache).
+@st.cache_resource(max_entries=64, show_spinner=False)
+def fig_donut_despesas(categorias, valores, cores, privacy):
+    textos = [_fmt_moeda(v, privacy) for v in valores]
+    fig = go.Figure(data=[go.Pie(
+        labels=list(categorias), values=list(valores), hole=0.65, sort=False,
+        marker=dict(colors=list(cores)), textinfo='percent', hoverinfo='text',
+        hovertemplate="<b>%{label}</b><br>%{customdata}<extra></extra>", customdata=textos
+    )])
+    fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", showlegend=False,
+                      margin=dict(t=10, b=10, l=10, r=10), height=350)
+    return fig
+
+
 # --- 5. SIDEBAR ---
 with st.sidebar:
     st.markdown('<div class="logo-text">BUDGETING</div>', unsafe_allow_html=True)
@@ -371,6 +508,10 @@ with st.sidebar:
 
 # --- 6. PROCESSAMENTO ---
 df_full = get_transacoes()
+# Meses arquivados são lidos de forma transparente, só quando o usuário navega até eles
+df_arquivo = get_transacoes_arquivadas(filtro_periodo)
+if not df_arquivo.empty:
+    df_full = pd.concat([df_full, df_arquivo], ignore_index=True) if not df_full.empty else df_arquivo
 cats_cores = get_categorias_dict()
 
 if not df_full.empty:
@@ -393,31 +534,16 @@ tab_dash, tab_add, tab_ext, tab_conf = st.tabs(["DASHBOARD", "LANÇAMENTOS", "EX
 # === ABA 1: DASHBOARD ===
 with tab_dash:
     # SALDO (Cards HTML Personalizados)
-    cor_saldo = COR_KIWI if saldo_mes >= 0 else COR_VERMELHO
-    classe_barra_saldo = "border-bottom-green" if saldo_mes >= 0 else "border-bottom-red"
-
-    st.markdown(f"""
-    <div class="card-box {classe_barra_saldo}" style="text-align:center;">
-        <div class="card-label">SALDO DISPONÍVEL (MÊS)</div>
-        <div class="card-value" style="color: {cor_saldo}; font-size: 40px;">{fmt_moeda(saldo_mes)}</div>
-    </div>
-    """, unsafe_allow_html=True)
+    privacy = st.session_state.privacy
+    st.markdown(html_card_saldo(float(saldo_mes), privacy), unsafe_allow_html=True)
 
     c_in, c_out = st.columns(2)
     with c_in:
-        st.markdown(f"""
-        <div class="card-box border-green">
-            <div class="card-label">ENTRADAS</div>
-            <div class="card-value">{fmt_moeda(receitas_mes)}</div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(html_card_fluxo("ENTRADAS", float(receitas_mes), "border-green", privacy),
+                    unsafe_allow_html=True)
     with c_out:
-        st.markdown(f"""
-        <div class="card-box border-red">
-            <div class="card-label">SAÍDAS</div>
-            <div class="card-value">{fmt_moeda(despesas_mes)}</div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(html_card_fluxo("SAÍDAS", float(despesas_mes), "border-red", privacy),
+                    unsafe_allow_html=True)
 
     st.markdown("---")
 
@@ -439,33 +565,9 @@ with tab_dash:
                         (df_filtrado['categoria'] == categoria_meta) & (df_filtrado['tipo'] == 'Despesa')]
                     gasto_atual = df_cat_mes['valor'].sum()
 
-                progresso = max(0.0, min(gasto_atual / teto, 1.0))
-                pct = (gasto_atual / teto) * 100
-                cor_barra = cats_cores.get(categoria_meta, "#FFFFFF")
-                cor_texto = "#FFFFFF"
-                aviso = ""
-
-                if gasto_atual > teto:
-                    cor_barra = COR_VERMELHO
-                    cor_texto = COR_VERMELHO
-                    aviso = "LIMITE EXCEDIDO"
-
-                st.markdown(f"""
-                <div style="background-color: #121212; padding: 15px; border-radius: 8px; border: 1px solid #333; margin-bottom: 15px;">
-                    <div style="font-weight: bold; font-size: 14px; margin-bottom: 5px; color:{cor_barra}">{categoria_meta}</div>
-                    <div style="font-size: 12px; color: #999; display: flex; justify-content: space-between;">
-                        <span>Gasto: {fmt_moeda(gasto_atual)}</span>
-                        <span>Teto: {fmt_moeda(teto)}</span>
-                    </div>
-                    <div style="width: 100%; background-color: #333; height: 8px; border-radius: 4px; margin-top: 8px;">
-                        <div style="width: {progresso * 100}%; background-color: {cor_barra}; height: 8px; border-radius: 4px;"></div>
-                    </div>
-                    <div style="display:flex; justify-content:space-between; margin-top:4px;">
-                        <span style="font-size: 10px; color: {cor_texto}; font-weight:bold;">{aviso}</span>
-                        <span style="font-size: 11px; color: #999;">{pct:.1f}%</span>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+                cor_categoria = cats_cores.get(categoria_meta, "#FFFFFF")
+                st.markdown(html_card_meta(categoria_meta, float(gasto_atual), float(teto), cor_categoria, privacy),
+                            unsafe_allow_html=True)
 
                 with st.expander("Ver Detalhes"):
                     if not df_cat_mes.empty:
@@ -497,15 +599,9 @@ with tab_dash:
 
         with c_graf:
             st.caption("VISÃO GERAL")
-            cores_ord = [cats_cores.get(c, '#FFF') for c in df_grouped['categoria']]
-            textos = [fmt_moeda(v) for v in df_grouped['valor']]
-            fig = go.Figure(data=[go.Pie(
-                labels=df_grouped['categoria'], values=df_grouped['valor'], hole=0.65, sort=False,
-                marker=dict(colors=cores_ord), textinfo='percent', hoverinfo='text',
-                hovertemplate="<b>%{label}</b><br>%{customdata}<extra></extra>", customdata=textos
-            )])
-            fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", showlegend=False,
-                              margin=dict(t=10, b=10, l=10, r=10), height=350)
+            cores_ord = tuple(cats_cores.get(c, '#FFF') for c in df_grouped['categoria'])
+            fig = fig_donut_despesas(tuple(df_grouped['categoria']), tuple(df_grouped['valor'].astype(float)),
+                                     cores_ord, privacy)
             st.plotly_chart(fig, use_container_width=True)
 
         with c_list:
@@ -670,6 +766,15 @@ with tab_conf:
                                                                                            row['nome']); st.rerun()
                 if c_d.button("EXCLUIR CATEGORIA", key=f"dl_{row['id']}"): delete_categoria(row['id']); st.rerun()
 
+    st.markdown("---")
+    st.subheader("Arquivo")
+    with st.expander("ARQUIVAR PERÍODOS ANTIGOS"):
+        meses_corte = st.number_input("Arquivar meses com mais de (meses)", min_value=1, max_value=120,
+                                      value=MESES_ARQUIVO_PADRAO, step=1, key="num_meses_arquivo")
+        if st.button("ARQUIVAR"):
+            corte = arquivar_periodos(int(meses_corte))
+            st.success(f"Meses anteriores a {corte} arquivados!"); time.sleep(1); st.rerun()
+
     st.markdown("---")
     cf, cr = st.columns(2)
     with cf: